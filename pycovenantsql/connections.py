@@ -1,17 +1,57 @@
 import sys
 import os
+import functools
+import contextlib
+import re
+import ssl
 import requests
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlencode, quote_plus
 from . import err
 from .cursors import Cursor
 from .optionfile import Parser
 from . import converters
-from ._compat import PY2, range_type, text_type, str_type, JYTHON, IRONPYTHON
+from ._compat import PY2, range_type, text_type, str_type
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 
 DEBUG = False
 VERBOSE = False
 
+#: Statements matching this are sent to the query endpoint, others to exec.
+_QUERY_RE = re.compile(br'\s*(?:select|show|desc)', re.IGNORECASE)
+
+_warnings_disabled = False
+
+
+def _disable_warnings():
+    """Silence urllib3's InsecureRequestWarning, once per process."""
+    global _warnings_disabled
+    if not _warnings_disabled:
+        requests.packages.urllib3.disable_warnings()
+        _warnings_disabled = True
+
+
+@functools.lru_cache(maxsize=16)
+def _read_config(path, mtime):
+    """Parse an option file, cached by path and modification time so that
+    opening many connections does not re-read the same file."""
+    cfg = Parser()
+    cfg.read(path)
+    return cfg
+
+
 class Connection(object):
     """
     Representation of a RPC connect with a CovenantSQL server.
@@ -33,20 +73,34 @@ class Connection(object):
     :param connect_timeout: Timeout before throwing an exception when connecting.
         (default: 10, min: 1, max: 31536000)
     :param read_default_group: Group to read from in the configuration file.
+    :param http2: Talk to the adapter over HTTP/2 using httpx instead of requests,
+        so queries share one multiplexed TLS session. Requires httpx[http2].
+        (default: False)
+    :param stream_results: Parse responses with ijson while they are received instead
+        of buffering the whole body first. Lowers peak memory for large result sets
+        at some CPU cost. Requires ijson, not supported together with http2.
+        (default: False)
 
     See `Connection <https://www.python.org/dev/peps/pep-0249/#connection-objects>`_ in the
     specification.
     """
 
-
-    _closed = False
+    __slots__ = (
+        '_resp', '_resp_json', '_closed', 'encoding', 'dsn', 'host', 'port', 'key',
+        'database', '_cert', '_query_uri', '_exec_uri', '_form_prefix', 'timeout',
+        '_stream_results', '_http2', '_session', '_prepared', '_send_settings', '_send',
+        'cursorclass', '_result', '_affected_rows', 'server_status', '_pipeline',
+        '__weakref__',
+    )
 
     def __init__(self, dsn=None, host=None, port=0, key=None, database=None,
                  https_pem=None, read_default_file=None,
                  cursorclass=Cursor, connect_timeout=None, read_default_group=None,
-                 read_timeout=None):
+                 read_timeout=None, http2=False, stream_results=False):
 
         self._resp = None
+        self._resp_json = None
+        self._closed = False
 
         # 1. pre process params in init
         self.encoding = 'utf8'
@@ -59,8 +113,12 @@ class Connection(object):
             if not read_default_group:
                 read_default_group = "python-client"
 
-            cfg = Parser()
-            cfg.read(os.path.expanduser(read_default_file))
+            path = os.path.abspath(os.path.expanduser(read_default_file))
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                mtime = None
+            cfg = _read_config(path, mtime)
 
             def _config(key, arg):
                 if arg:
@@ -104,6 +162,13 @@ class Connection(object):
             self._query_uri = "http://" + self.host + ":" + str(self.port) + "/v1/query"
             self._exec_uri = "http://" + self.host + ":" + str(self.port) + "/v1/exec"
 
+        # requests are form posts of database and query; the database part
+        # never changes, so urlencode it once and only quote the sql per query
+        if self.database is not None:
+            self._form_prefix = urlencode({"database": self.database}).encode('ascii') + b"&query="
+        else:
+            self._form_prefix = b"query="
+
         if VERBOSE:
             try:
                 import http.client as http_client
@@ -111,7 +176,7 @@ class Connection(object):
                 # Python 2
                 import httplib as http_client
             http_client.HTTPConnection.debuglevel = 1
-        requests.packages.urllib3.disable_warnings()
+        _disable_warnings()
 
         self.timeout = None
         if connect_timeout is not None and connect_timeout <= 0:
@@ -123,14 +188,77 @@ class Connection(object):
         if connect_timeout is not None or read_timeout is not None:
             self.timeout = (connect_timeout, read_timeout)
 
+        if stream_results:
+            if ijson is None:
+                raise err.NotSupportedError("stream_results requires ijson, install it with: pip install ijson")
+            if http2:
+                raise err.NotSupportedError("stream_results is not supported with http2")
+        self._stream_results = stream_results
+
+        # keep one session per connection so the TCP/TLS connection to the
+        # adapter is reused across queries instead of set up for each one,
+        # it is created by connect()
+        self._http2 = http2
+        self._session = None
+
         self.cursorclass = cursorclass
 
         self._result = None
         self._affected_rows = 0
+        self._pipeline = None
 
         self.connect()
 
+    def _open_session(self):
+        """Create the HTTP client used to talk to the adapter.
+
+        Called from connect(), so a closed connection gets a fresh client:
+        unlike a requests.Session, an httpx.Client cannot be reused after
+        close().
+        """
+        if self._http2:
+            try:
+                import httpx
+            except ImportError:
+                raise err.NotSupportedError("http2 requires httpx, install it with: pip install httpx[http2]")
+            # same as requests' verify=False plus client cert, httpx takes both as an SSLContext
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+            if isinstance(self._cert, tuple):
+                ssl_context.load_cert_chain(*self._cert)
+            elif self._cert:
+                ssl_context.load_cert_chain(self._cert)
+            connect_timeout, read_timeout = self.timeout or (None, None)
+            self._session = httpx.Client(
+                http2=True, verify=ssl_context,
+                timeout=httpx.Timeout(None, connect=connect_timeout, read=read_timeout),
+                headers={"Content-Type": "application/x-www-form-urlencoded"})
+        else:
+            self._session = requests.Session()
+            self._session.verify = False
+            self._session.headers["Content-Type"] = "application/x-www-form-urlencoded"
+            if self._cert:
+                self._session.cert = self._cert
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+            # prepare both endpoints and resolve proxy/verify/cert settings from
+            # the environment once, each query then only swaps in its body
+            self._prepared = {}
+            for uri in (self._query_uri, self._exec_uri):
+                self._prepared[uri] = self._session.prepare_request(requests.Request("POST", uri))
+            # responses are always streamed so the body can be read in one go,
+            # see _execute_command
+            self._send_settings = self._session.merge_environment_settings(
+                self._query_uri, {}, True, False, self._cert)
+
+        self._send = self._make_sender()
+
     def connect(self):
+        if self._session is None:
+            self._open_session()
         self._closed = False
         self._execute_command("select 1;")
         self._read_ok_packet()
@@ -147,6 +275,8 @@ class Connection(object):
         if self._closed:
             raise err.Error("Already closed")
         self._closed = True
+        self._session.close()
+        self._session = None
 
     @property
     def open(self):
@@ -175,6 +305,30 @@ class Connection(object):
         #self._execute_command("ROLLBACK")
         #self._read_ok_packet()
 
+    @contextlib.contextmanager
+    def pipeline(self):
+        """
+        Batch write statements into a single request.
+
+        Inside the block, statements for the exec endpoint are queued instead
+        of sent, then posted together, joined by ``;``, when the block exits.
+        Queries (select, show, desc) flush the queue first so they see the
+        earlier writes. Queued statements report a rowcount of -1, as their
+        effect is not known yet, and are discarded if the block raises::
+
+            with conn.pipeline():
+                cursor.execute("INSERT INTO `users` (`email`) VALUES (%s)", (email,))
+                cursor.execute("UPDATE `stats` SET `users` = `users` + 1")
+        """
+        if self._pipeline is not None:
+            raise err.ProgrammingError("Pipeline already started")
+        self._pipeline = []
+        try:
+            yield self
+            self._flush_pipeline()
+        finally:
+            self._pipeline = None
+
 
     def cursor(self, cursor=None):
         """
@@ -189,15 +343,27 @@ class Connection(object):
 
     # The following methods are INTERNAL USE ONLY (called from Cursor)
     def query(self, sql):
-        if isinstance(sql, text_type) and not (JYTHON or IRONPYTHON):
-            if PY2:
-                sql = sql.encode(self.encoding)
-            else:
-                sql = sql.encode(self.encoding, 'surrogateescape')
+        if self._pipeline is not None:
+            sql = self._encode_sql(sql)
+            if not _QUERY_RE.match(sql):
+                self._pipeline.append(sql)
+                # not sent yet, so the affected rows are unknown (PEP 249: -1)
+                self._result = CovenantSQLResult(self)
+                self._result.affected_rows = -1
+                self._affected_rows = -1
+                return self._affected_rows
+            self._flush_pipeline()
         self._execute_command(sql)
         self._affected_rows = self._read_query_result()
         return self._affected_rows
 
+    def _flush_pipeline(self):
+        statements, self._pipeline = self._pipeline, []
+        if statements:
+            # newline after each ; so a trailing -- comment cannot swallow the next statement
+            self._execute_command(b";\n".join(statements))
+            self._affected_rows = self._read_query_result()
+
     def _execute_command(self, sql):
         """
         :raise InterfaceError: If the connection is closed.
@@ -206,24 +372,18 @@ class Connection(object):
         if self._closed:
             raise err.InterfaceError("Connection closed")
 
-        if isinstance(sql, text_type):
-            sql = sql.encode(self.encoding)
-
-        if isinstance(sql, bytearray):
-            sql = bytes(sql)
+        sql = self._encode_sql(sql)
 
         # drop last command return
         if self._resp is not None:
             self._resp = None
 
         # post request
-        data = {"database": self.database,"query": sql}
+        data = self._form_prefix + quote_plus(sql).encode('ascii')
         if DEBUG:
             print("DEBUG: sending query:", sql)
         try:
-            if (sql.lower().lstrip().startswith(b'select') or
-                sql.lower().lstrip().startswith(b'show') or
-                sql.lower().lstrip().startswith(b'desc')):
+            if _QUERY_RE.match(sql):
                 self._resp = self._send(self._query_uri, data=data)
             else:
                 self._resp = self._send(self._exec_uri, data=data)
@@ -231,18 +391,66 @@ class Connection(object):
             raise err.InterfaceError("Request proxy err: %s" % error)
 
         try:
-            self._resp_json = self._resp.json()
+            if self._stream_results:
+                self._resp_json = _load_stream(self._resp)
+            elif self._http2:
+                self._resp_json = json_loads(self._resp.content)
+            else:
+                # a single raw read skips the chunked copy and join that
+                # resp.content does before the body can be parsed
+                self._resp.raw.decode_content = True
+                self._resp_json = json_loads(self._resp.raw.read())
             if DEBUG:
                 print("DEBUG: response:", self._resp_json)
         except Exception as error:
-            raise err.InterfaceError("Proxy return invalid data", self._resp.reason)
+            raise err.InterfaceError("Proxy return invalid data", _reason(self._resp))
 
-    def _send(self, uri, data):
-        session = requests.Session()
-        session.verify = False
-        if self._cert:
-            session.cert = self._cert
-        return session.post(uri, data, timeout=self.timeout)
+    def _encode_sql(self, sql):
+        """Return sql as bytes, encoding it at most once."""
+        if isinstance(sql, bytes):
+            return sql
+        if isinstance(sql, text_type):
+            if PY2:
+                return sql.encode(self.encoding)
+            if self.encoding == 'utf8':
+                # the no-argument encode() skips codec lookup and is strict
+                # utf-8, which only differs from surrogateescape on surrogates
+                try:
+                    return sql.encode()
+                except UnicodeEncodeError:
+                    pass
+            return sql.encode(self.encoding, 'surrogateescape')
+        if isinstance(sql, bytearray):
+            return bytes(sql)
+        return sql
+
+    def _make_sender(self):
+        """Return the function that posts a form body to an endpoint.
+
+        It is built once per connection with the transport and its settings
+        bound as locals, so the per query path neither branches on the
+        transport nor looks them up on the connection again.
+        """
+        if self._http2:
+            # the timeout is set on the httpx client itself
+            post = self._session.post
+
+            def send(uri, data):
+                return post(uri, content=data)
+            return send
+
+        timeout = self.timeout
+
+        send_request = self._session.send
+        prepared = self._prepared
+        settings = self._send_settings
+
+        def send(uri, data):
+            request = prepared[uri].copy()
+            request.body = data
+            request.headers["Content-Length"] = str(len(data))
+            return send_request(request, timeout=timeout, **settings)
+        return send
 
     def escape(self, obj, mapping=None):
         """Escape whatever value you pass to it.
@@ -268,17 +476,22 @@ class Connection(object):
         result = CovenantSQLResult(self)
         result.read()
         self._result = result
+        # the rows now live in result, don't keep the decoded response alive
+        # next to them until the following query
+        self._resp = self._resp_json = None
         return result.affected_rows
 
     def _read_ok_packet(self):
-        self.server_status = self._resp_json["success"]
-        if not self.server_status:
-            raise err.InternalError("InternalError: ", self._resp_json["status"])
+        resp_json = self._resp_json
+        self.server_status = status = resp_json.get("success")
+        if not status:
+            raise err.InternalError("InternalError: ", resp_json.get("status"))
 
-        if not self._resp.ok:
-            raise err.OperationalError("Proxy return false", self._resp.reason)
+        resp = self._resp
+        if resp.status_code >= 400:
+            raise err.OperationalError("Proxy return false", _reason(resp))
 
-        return self.server_status
+        return status
 
     def __enter__(self):
         """Context manager that returns a Cursor"""
@@ -291,7 +504,75 @@ class Connection(object):
         else:
             self.commit()
 
+def _load_stream(resp):
+    """Parse a streamed response body with ijson.
+
+    Result rows are turned into tuples as they are read, so neither the raw
+    body nor a second list-of-lists copy of the rows is ever held in memory.
+    """
+    resp.raw.decode_content = True
+    builder = ijson.ObjectBuilder()
+    rows = row = None
+    has_rows = False
+    # builder and nesting depth of a cell holding an array or object
+    cell = None
+    depth = 0
+    try:
+        for prefix, event, value in ijson.parse(resp.raw, use_float=True):
+            if cell is not None:
+                cell.event(event, value)
+                if event in ('start_array', 'start_map'):
+                    depth += 1
+                elif event in ('end_array', 'end_map'):
+                    depth -= 1
+                    if not depth:
+                        row.append(cell.value)
+                        cell = None
+                continue
+            if prefix == 'data.rows':
+                has_rows = True
+                if event == 'start_array':
+                    rows = []
+                elif event not in ('end_array', 'null'):
+                    raise err.InterfaceError("Unsupported response format: rows is not an array")
+                continue
+            if prefix == 'data.rows.item':
+                if event == 'start_array':
+                    row = []
+                elif event == 'end_array':
+                    rows.append(tuple(row))
+                else:
+                    raise err.InterfaceError("Unsupported response format: row is not an array")
+                continue
+            if prefix == 'data.rows.item.item':
+                if event in ('start_array', 'start_map'):
+                    cell = ijson.ObjectBuilder()
+                    cell.event(event, value)
+                    depth = 1
+                else:
+                    row.append(value)
+                continue
+            builder.event(event, value)
+    finally:
+        resp.close()
+
+    result = builder.value
+    if has_rows:
+        result['data']['rows'] = rows
+    return result
+
+
+def _reason(resp):
+    # requests names the status text ``reason``, httpx ``reason_phrase``
+    return getattr(resp, "reason", None) or getattr(resp, "reason_phrase", None)
+
+
 class CovenantSQLResult(object):
+    __slots__ = (
+        'connection', 'affected_rows', 'insert_id', 'warning_count', 'message',
+        'field_count', 'description', 'rows', 'has_next',
+    )
+
     def __init__(self, connection):
         """
         :type connection: Connection
@@ -318,32 +599,36 @@ class CovenantSQLResult(object):
         # read json data
         try:
             # return from query api, data like {'columns': ['name'], 'rows': [['test'], ['test2'], ['test3'], ['test4']], 'types': ['TEXT']}
-            self.affected_rows = len(data['rows'])
+            rows = data['rows']
+            self.affected_rows = len(rows)
         except:
             # return from exec api, data like {'affected_rows': 4, 'last_insert_id': 4}
             self.affected_rows = data['affected_rows']
             self.insert_id = data['last_insert_id']
             return
 
-        self.field_count = len(data['columns'])
+        columns = data['columns']
+        self.field_count = len(columns)
 
         try:
-            description = []
-            for i in range(self.field_count):
-                fields = []
-                fields.append(data['columns'][i])
-                fields.append(data['types'][i])
-                description.append(tuple(fields))
-            self.description = tuple(description)
-
-            rows = []
-            for line in data['rows']:
-                row = []
-                for i in range(self.field_count):
-                    column_data = converters.convert_column_data(self.description[i][1], line[i])
-                    row.append(column_data)
-                rows.append(tuple(row))
-            self.rows = tuple(rows)
+            types = data['types']
+            self.description = tuple(zip(columns, types))
+
+            # only columns with a decoder (date, time...) need touching per row
+            decoders = [(i, converters.column_converter(t)) for i, t in enumerate(types)]
+            decoders = [(i, decode) for i, decode in decoders if decode is not None]
+            if not decoders:
+                self.rows = tuple(map(tuple, rows))
+                return
+
+            decoded = []
+            for line in rows:
+                row = list(line)
+                for i, decode in decoders:
+                    if row[i] is not None:
+                        row[i] = decode(row[i])
+                decoded.append(tuple(row))
+            self.rows = tuple(decoded)
         except Exception as error:
-            raise err.InterfaceError("Read proxy return data err:" % error)
+            raise err.InterfaceError("Read proxy return data err: %s" % error)
 
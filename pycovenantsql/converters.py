@@ -139,6 +139,23 @@ def _convert_second_fraction(s):
     s = s.ljust(6, '0')
     return int(s[:6])
 
+
+#: fromisoformat truncates fractions beyond microseconds where arrow rounds them,
+#: so such values are left to arrow.
+ISO_LONG_FRACTION_RE = re.compile(r"[.,]\d{7}")
+
+
+def _fromisoformat(cls, obj):
+    """Parse obj with cls.fromisoformat, the fast path for the common ISO
+    strings. Returns None when arrow has to decide."""
+    if not isinstance(obj, text_type) or ISO_LONG_FRACTION_RE.search(obj):
+        return None
+    try:
+        return cls.fromisoformat(obj)
+    except (AttributeError, ValueError):
+        return None
+
+
 def convert_datetime(obj):
     """Returns a DATETIME or TIMESTAMP column value as a datetime object:
 
@@ -153,6 +170,13 @@ def convert_datetime(obj):
     if not PY2 and isinstance(obj, (bytes, bytearray)):
         obj = obj.decode('ascii')
 
+    dt = _fromisoformat(datetime.datetime, obj)
+    if dt is not None:
+        if dt.tzinfo is None:
+            # arrow reads naive values as UTC
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
+        return dt
+
     try:
         return arrow.get(obj).datetime
     except Exception as err:
@@ -214,6 +238,11 @@ def convert_time(obj):
     if not PY2 and isinstance(obj, (bytes, bytearray)):
         obj = obj.decode('ascii')
 
+    t = _fromisoformat(datetime.time, obj)
+    if t is not None:
+        # arrow keeps the wall clock time and drops any offset
+        return t.replace(tzinfo=None)
+
     try:
         return arrow.get("1970-01-01T"+obj).time()
     except Exception:
@@ -235,6 +264,9 @@ def convert_date(obj):
     """
     if not PY2 and isinstance(obj, (bytes, bytearray)):
         obj = obj.decode('ascii')
+    d = _fromisoformat(datetime.date, obj)
+    if d is not None:
+        return d
     try:
         return arrow.get(obj).date()
     except Exception as err:
@@ -265,6 +297,13 @@ def convert_characters(connection, data):
         data = data.decode("utf8")
     return data
 
+def column_converter(column_type):
+    """Returns the decoder for a result column type, or None when values of
+    that type are passed through unchanged."""
+    if not isinstance(column_type, text_type):
+        return None
+    return decoders.get(column_type.lower().strip())
+
 def convert_column_data(column_type, column_data):
     data = column_data
 
@@ -272,16 +311,9 @@ def convert_column_data(column_type, column_data):
     if data is None:
         return data
 
-    if not isinstance(column_type, text_type):
-        return data
-
-    column_type = column_type.lower().strip()
-    if column_type == 'time':
-        data = convert_time(column_data)
-    elif column_type == 'date':
-        data = convert_date(column_data)
-    elif column_type == 'datetime':
-        data = convert_datetime(column_data)
+    converter = column_converter(column_type)
+    if converter is not None:
+        data = converter(column_data)
 
     return data
 
@@ -309,3 +341,8 @@ encoders = {
 if not PY2 or JYTHON or IRONPYTHON:
     encoders[bytes] = escape_bytes
 
+decoders = {
+    'time': convert_time,
+    'date': convert_date,
+    'datetime': convert_datetime,
+}
@@ -246,12 +246,14 @@ class Cursor(object):
                 else:
                     v = v.encode(encoding, 'surrogateescape')
             if len(sql) + len(v) + len(postfix) + 1 > max_stmt_length:
-                rows += self.execute(sql + postfix)
+                rows += self.execute(b''.join((sql, postfix)))
                 sql = bytearray(prefix)
             else:
                 sql += b','
             sql += v
-        rows += self.execute(sql + postfix)
+        # join straight into bytes: sql + postfix would build another bytearray
+        # that the connection then has to copy to bytes again
+        rows += self.execute(b''.join((sql, postfix)))
         self.rowcount = rows
         return rows
 
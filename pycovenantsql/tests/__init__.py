@@ -1,7 +1,7 @@
 from pycovenantsql.tests.test_basic import *
 from pycovenantsql.tests.test_connection import *
 from pycovenantsql.tests.test_cursor import *
-#from pycovenantsql.tests.test_converters import *
+from pycovenantsql.tests.test_converters import *
 #from pycovenantsql.tests.test_err import *
 #from pycovenantsql.tests.test_issues import *
 #from pycovenantsql.tests.test_nextset import *
@@ -1,11 +1,19 @@
 import datetime
+import io
 import sys
 import time
+import unittest2
 import pycovenantsql
+from pycovenantsql import connections
 from pycovenantsql.tests import base
 from pycovenantsql._compat import text_type
 from pycovenantsql.converters import encoders
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 
 class TempUser:
     def __init__(self, c, user, db, auth=None, authdata=None, password=None):
@@ -50,6 +58,42 @@ class TestConnection(base.PyCovenantSQLTestCase):
         cur.execute("SELECT '" + t + "'")
         assert cur.fetchone()[0] == t
 
+    @unittest2.skipIf(connections.ijson is None, "ijson not installed")
+    def test_stream_results(self):
+        c = self.connect(stream_results=True)
+        cur = c.cursor()
+        cur.execute('create table test_stream ( a int, b text )')
+        cur.execute("insert into test_stream values (1, 'x'), (2, null)")
+        cur.execute('select a, b from test_stream order by a')
+        self.assertEqual(((1, 'x'), (2, None)), cur.fetchall())
+        cur.execute('drop table test_stream')
+
+    @unittest2.skipIf(connections.ijson is None, "ijson not installed")
+    def test_load_stream(self):
+        """_load_stream must decode bodies like json_loads, rows as tuples"""
+        class Response(object):
+            def __init__(self, body):
+                self.raw = io.BytesIO(body)
+
+            def close(self):
+                pass
+
+        bodies = [
+            b'{"success": true, "status": "ok", "data": {"columns": ["a", "b", "c"], '
+            b'"types": ["TEXT", "INT", "JSON"], "rows": [["x", 1.5, null], '
+            b'["y", 2, [1, [2]]], ["z", 3, {"k": [3], "m": {}}]]}}',
+            b'{"success": true, "status": "ok", "data": {"affected_rows": 1, "last_insert_id": 2}}',
+            b'{"success": false, "status": "error", "data": null}',
+        ]
+        for body in bodies:
+            expected = connections.json_loads(body)
+            if expected["data"] and "rows" in expected["data"]:
+                expected["data"]["rows"] = [tuple(row) for row in expected["data"]["rows"]]
+            self.assertEqual(expected, connections._load_stream(Response(body)))
+
+        with self.assertRaises(pycovenantsql.err.InterfaceError):
+            connections._load_stream(Response(b'{"data": {"rows": [{"a": 1}]}}'))
+
     def test_read_default_group(self):
         conn = self.connect(
             read_default_group='client',
@@ -70,6 +114,53 @@ class TestConnection(base.PyCovenantSQLTestCase):
             self.assertEqual(1,cur.fetchone()[0])
             cur.execute('drop table test')
 
+    def test_close_connect(self):
+        c = self.connect()
+        c.close()
+        self.assertFalse(c.open)
+        c.connect()
+        self.assertTrue(c.open)
+        cur = c.cursor()
+        cur.execute('select 1')
+        self.assertEqual(1, cur.fetchone()[0])
+
+    @unittest2.skipIf(httpx is None, "httpx not installed")
+    def test_http2(self):
+        c = self.connect(http2=True)
+        cur = c.cursor()
+        cur.execute('create table test_http2 ( a int )')
+        cur.execute('insert into test_http2 values ((1))')
+        self.assertEqual(1, cur.rowcount)
+        cur.execute('select a from test_http2')
+        self.assertEqual(1, cur.fetchone()[0])
+        c.close()
+        c.connect()
+        cur = c.cursor()
+        cur.execute('select count(*) from test_http2')
+        self.assertEqual(1, cur.fetchone()[0])
+        cur.execute('drop table test_http2')
+
+    def test_pipeline(self):
+        c = self.connect()
+        cur = c.cursor()
+        cur.execute('create table test_pipeline ( a int )')
+        with c.pipeline():
+            cur.execute('insert into test_pipeline values ((1))')
+            cur.execute('insert into test_pipeline values ((2))')
+            self.assertEqual(-1, cur.rowcount)
+            cur.execute('select count(*) from test_pipeline')
+            self.assertEqual(2, cur.fetchone()[0])
+            cur.execute('insert into test_pipeline values ((3))')
+        cur.execute('select count(*) from test_pipeline')
+        self.assertEqual(3, cur.fetchone()[0])
+        with self.assertRaises(ValueError):
+            with c.pipeline():
+                cur.execute('insert into test_pipeline values ((4))')
+                raise ValueError
+        cur.execute('select count(*) from test_pipeline')
+        self.assertEqual(3, cur.fetchone()[0])
+        cur.execute('drop table test_pipeline')
+
 
 # A custom type and function to escape it
 class Foo(object):
@@ -0,0 +1,50 @@
+import unittest
+
+import arrow
+
+from pycovenantsql import converters
+
+
+class TestConverters(unittest.TestCase):
+    """The stdlib fast paths must decode exactly like arrow does."""
+
+    datetimes = [
+        "2020-01-02 03:04:05",
+        "2020-01-02T03:04:05",
+        "2020-01-02T03:04:05.123456",
+        "2020-01-02T03:04:05Z",
+        "2020-01-02T03:04:05+08:00",
+        "2020-01-02T03:04:05.9999999Z",
+        "2020-01-02T03:04:05.123456789+08:00",
+        "2020-01-02",
+    ]
+
+    times = [
+        "03:04:05",
+        "03:04:05.5",
+        "03:04:05Z",
+        "03:04:05+08:00",
+        "03:04:05.1234567",
+        "03:04:05.9999999",
+    ]
+
+    dates = [
+        "2020-01-02",
+        "20200102",
+    ]
+
+    def test_convert_datetime(self):
+        for value in self.datetimes:
+            self.assertEqual(arrow.get(value).datetime, converters.convert_datetime(value), value)
+            self.assertEqual(arrow.get(value).datetime, converters.convert_datetime(value.encode()), value)
+
+    def test_convert_time(self):
+        for value in self.times:
+            self.assertEqual(arrow.get("1970-01-01T" + value).time(), converters.convert_time(value), value)
+
+    def test_convert_date(self):
+        for value in self.dates:
+            self.assertEqual(arrow.get(value).date(), converters.convert_date(value), value)
+
+    def test_convert_time_timedelta(self):
+        self.assertEqual(converters.convert_timedelta("25:06:17"), converters.convert_time("25:06:17"))
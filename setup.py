@@ -20,6 +20,11 @@ setup(
         "arrow",
         "pycrypto",
     ],
+    extras_require={
+        "speedups": ["orjson"],
+        "http2": ["httpx[http2]"],
+        "stream": ["ijson>=3.1"],
+    },
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Programming Language :: Python :: 2',